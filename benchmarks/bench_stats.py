@@ -0,0 +1,10 @@
+"""Benchmark skriptlari uchun umumiy statistika yordamchilari."""
+import math
+
+
+def percentile(values, pct):
+    """Nearest-rank usulidagi persentil: tartiblangan qiymatlardan ceil(pct/100 * n)-chisi."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
@@ -0,0 +1,648 @@
+"""
+Konvertatsiya tezligi benchmarki (DOCX/PPTX/XLSX/TXT -> PDF).
+
+Generatsiya qilingan hujjatlar korpusi (o'lcham darajalari bo'yicha) turli
+backendlar orqali PDF ga o'tkaziladi:
+
+    cold       - main.convert_to_pdf, har bir chaqiruvda yangi soffice (productiondagi yo'l)
+    parallel   - har bir worker o'z profili bilan alohida soffice jarayonini ishga tushiradi
+    unoserver  - har bir worker uchun doimiy (warm) unoserver, konvertatsiya unoconvert orqali;
+                 faqat unoserver/unoconvert PATH da bo'lsa ishlaydi
+
+Har bir (backend, concurrency, format) fazasi uchun docs/sec, latency
+taqsimoti, CPU-soniyalar va konvertor jarayonlarining peak xotirasi o'lchanadi.
+
+Ishga tushirish (repo ildizidan):
+
+    python benchmarks/convert_throughput.py --backends cold,parallel,unoserver \
+        --concurrency 1,2,4 --json bench_output.json
+
+Oldingi natija bilan solishtirish:
+
+    python benchmarks/convert_throughput.py --compare old.json --json new.json
+
+Baseline boshqa korpus, sozlamalar yoki soffice versiyasi bilan olingan bo'lsa,
+farqlar chiqariladi va solishtirish o'tkazib yuboriladi (`--force-compare` bilan majburlash mumkin).
+CPU-soniyalar faqat o'lchangan konvertatsiyalarni o'z ichiga oladi; isitish va
+server ishga tushishi `startup_cpu_s` da alohida ko'rsatiladi.
+
+Eslatma: main.convert_to_pdf subprocess.run bilan event loopni bloklaydi, shuning
+uchun `cold` backendda concurrency > 1 amalda ketma-ket bajariladi.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import hashlib
+import socket
+import asyncio
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+from xml.sax.saxutils import escape
+
+from bench_stats import percentile
+
+FORMATS = ["docx", "pptx", "xlsx", "txt"]
+DEFAULT_TIERS = "small:1,medium:10,large:50"
+
+# Bir "birlik" uchun kontent hajmi: sahifa atrofida
+PARAGRAPHS_PER_UNIT = 40
+SLIDES_PER_UNIT = 3
+ROWS_PER_UNIT = 200
+COLUMNS = 8
+
+UNOSERVER_BASE_PORT = 12000
+SERVER_START_TIMEOUT = 60
+
+WORDS = ("hujjat konvertatsiya fayl bot balans referal to'lov hisobot jadval taqdimot "
+         "matn sahifa natija tezlik server xotira soffice format").split()
+
+
+def parse_tiers(text):
+    tiers = []
+    for part in text.split(","):
+        name, units = part.split(":")
+        tiers.append((name.strip(), int(units)))
+    return tiers
+
+
+def latency_summary(values):
+    return {
+        "p50_ms": round(percentile(values, 50) * 1000, 1),
+        "p95_ms": round(percentile(values, 95) * 1000, 1),
+        "p99_ms": round(percentile(values, 99) * 1000, 1),
+        "mean_ms": round(sum(values) / len(values) * 1000, 1) if values else 0.0,
+        "max_ms": round(max(values) * 1000, 1) if values else 0.0,
+    }
+
+
+# --- KORPUS GENERATSIYASI ---
+FLAT_ODF_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<office:document xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+    'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+    'xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" '
+    'xmlns:presentation="urn:oasis:names:tc:opendocument:xmlns:presentation:1.0" '
+    'xmlns:svg="urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0" '
+    'office:version="1.2" office:mimetype="{mimetype}"><office:body>'
+)
+FLAT_ODF_FOOTER = "</office:body></office:document>"
+
+
+def _sentence(rng, words=12):
+    return escape(" ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + ".")
+
+
+def flat_text(rng, units):
+    body = "".join(f"<text:p>{_sentence(rng, 30)}</text:p>" for _ in range(units * PARAGRAPHS_PER_UNIT))
+    return (FLAT_ODF_HEADER.format(mimetype="application/vnd.oasis.opendocument.text")
+            + f"<office:text>{body}</office:text>" + FLAT_ODF_FOOTER)
+
+
+def flat_spreadsheet(rng, units):
+    rows = []
+    for _ in range(units * ROWS_PER_UNIT):
+        cells = [f'<table:table-cell office:value-type="string"><text:p>{escape(rng.choice(WORDS))}</text:p></table:table-cell>']
+        for _ in range(COLUMNS - 1):
+            value = rng.randint(0, 1_000_000)
+            cells.append(f'<table:table-cell office:value-type="float" office:value="{value}"><text:p>{value}</text:p></table:table-cell>')
+        rows.append(f"<table:table-row>{''.join(cells)}</table:table-row>")
+    return (FLAT_ODF_HEADER.format(mimetype="application/vnd.oasis.opendocument.spreadsheet")
+            + f'<office:spreadsheet><table:table table:name="Sheet1">{"".join(rows)}</table:table></office:spreadsheet>'
+            + FLAT_ODF_FOOTER)
+
+
+def flat_presentation(rng, units):
+    pages = []
+    for n in range(units * SLIDES_PER_UNIT):
+        items = "".join(f"<text:p>{_sentence(rng, 8)}</text:p>" for _ in range(6))
+        pages.append(
+            f'<draw:page draw:name="slide{n + 1}">'
+            f'<draw:frame svg:x="1cm" svg:y="1cm" svg:width="24cm" svg:height="3cm"><draw:text-box>'
+            f"<text:p>{_sentence(rng, 5)}</text:p></draw:text-box></draw:frame>"
+            f'<draw:frame svg:x="1cm" svg:y="5cm" svg:width="24cm" svg:height="12cm"><draw:text-box>'
+            f"{items}</draw:text-box></draw:frame></draw:page>"
+        )
+    return (FLAT_ODF_HEADER.format(mimetype="application/vnd.oasis.opendocument.presentation")
+            + f"<office:presentation>{''.join(pages)}</office:presentation>" + FLAT_ODF_FOOTER)
+
+
+FLAT_SOURCES = {
+    "docx": (".fodt", flat_text),
+    "xlsx": (".fods", flat_spreadsheet),
+    "pptx": (".fodp", flat_presentation),
+}
+
+
+def corpus_key(tiers, docs_per_tier, seed):
+    params = {
+        "seed": seed,
+        "tiers": tiers,
+        "docs_per_tier": docs_per_tier,
+        "units": [PARAGRAPHS_PER_UNIT, SLIDES_PER_UNIT, ROWS_PER_UNIT, COLUMNS],
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def hash_files(paths):
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def generate_corpus(corpus_root, tiers, docs_per_tier, seed):
+    """
+    Korpusni (seed, tiers, docs_per_tier) kalitiga bog'langan papkada yaratadi.
+    manifest.json dagi hash fayllarga mos kelsa korpus qayta ishlatiladi, aks holda
+    papka noldan yaratiladi (qisman to'ldirilgan korpus RNG ketma-ketligini buzadi).
+    OOXML fayllar flat ODF dan soffice yordamida olinadi, TXT to'g'ridan-to'g'ri yoziladi.
+    Qaytaradi: ([{"path", "format", "tier"}, ...], manifest)
+    """
+    key = corpus_key(tiers, docs_per_tier, seed)
+    corpus_dir = os.path.join(corpus_root, f"corpus_{key}")
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    corpus = [
+        {"path": os.path.join(corpus_dir, f"{tier}_{n}_{fmt}.{fmt}"), "format": fmt, "tier": tier}
+        for tier, _ in tiers
+        for n in range(docs_per_tier)
+        for fmt in FORMATS
+    ]
+    paths = [doc["path"] for doc in corpus]
+
+    if os.path.exists(manifest_path) and all(os.path.exists(path) for path in paths):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("sha256") == hash_files(paths):
+            return corpus, manifest
+
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    source_dir = os.path.join(corpus_dir, "src")
+    os.makedirs(source_dir)
+    rng = random.Random(seed)
+    units_by_tier = dict(tiers)
+    pending = {fmt: [] for fmt in FLAT_SOURCES}
+
+    for doc in corpus:
+        fmt, units = doc["format"], units_by_tier[doc["tier"]]
+        if fmt == "txt":
+            with open(doc["path"], "w", encoding="utf-8") as f:
+                for _ in range(units * PARAGRAPHS_PER_UNIT):
+                    f.write(" ".join(rng.choice(WORDS) for _ in range(30)) + "\n")
+            continue
+        extension, build = FLAT_SOURCES[fmt]
+        source = os.path.join(source_dir, os.path.basename(doc["path"]).rsplit(".", 1)[0] + extension)
+        with open(source, "w", encoding="utf-8") as f:
+            f.write(build(rng, units))
+        pending[fmt].append(source)
+
+    for fmt, sources in pending.items():
+        if not sources:
+            continue
+        process = subprocess.run(
+            ["soffice", "--headless", "--convert-to", fmt, "--outdir", source_dir, *sources],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Korpus generatsiyasi xatosi ({fmt}): {process.stderr.decode()}")
+        for source in sources:
+            converted = source.rsplit(".", 1)[0] + f".{fmt}"
+            os.replace(converted, os.path.join(corpus_dir, os.path.basename(converted)))
+    shutil.rmtree(source_dir)
+
+    manifest = {
+        "key": key,
+        "seed": seed,
+        "tiers": units_by_tier,
+        "docs_per_tier": docs_per_tier,
+        "sha256": hash_files(paths),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return corpus, manifest
+
+
+# --- BACKENDLAR ---
+def _profile_url(workdir, worker):
+    return "file://" + os.path.join(workdir, f"profile_{worker}")
+
+
+class ColdBackend:
+    """Productiondagi yo'l: main.convert_to_pdf, har chaqiruvda yangi soffice."""
+
+    name = "cold"
+
+    def __init__(self):
+        self.convert_to_pdf = None
+
+    @staticmethod
+    def available():
+        return shutil.which("soffice") is not None
+
+    async def start(self, concurrency, workdir):
+        # main.py sozlamalarni import paytida tekshiradi; konvertatsiya uchun ular kerak emas
+        for key, value in {
+            "BOT_TOKEN": "123456:BENCH-fake-token",
+            "ADMIN_ID": "1",
+            "DATABASE_URL": "postgresql://localhost/unused",
+            "BASE_WEBHOOK_URL": "http://127.0.0.1",
+            "PAYMENT_TOKEN": "bench",
+        }.items():
+            os.environ.setdefault(key, value)
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if repo_root not in sys.path:
+            sys.path.insert(0, repo_root)
+        import main
+        self.convert_to_pdf = main.convert_to_pdf
+
+    async def convert(self, worker, input_path, output_dir):
+        return await self.convert_to_pdf(input_path, output_dir)
+
+    async def stop(self):
+        pass
+
+
+class ParallelBackend:
+    """Har bir worker o'z profili bilan soffice ishga tushiradi, jarayonlar parallel ishlaydi."""
+
+    name = "parallel"
+
+    def __init__(self):
+        self.workdir = None
+
+    @staticmethod
+    def available():
+        return shutil.which("soffice") is not None
+
+    async def start(self, concurrency, workdir):
+        self.workdir = workdir
+
+    async def convert(self, worker, input_path, output_dir):
+        process = await asyncio.create_subprocess_exec(
+            "soffice", f"-env:UserInstallation={_profile_url(self.workdir, worker)}",
+            "--headless", "--convert-to", "pdf", "--outdir", output_dir, input_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        await process.communicate()
+        if process.returncode != 0:
+            return None
+        return os.path.join(output_dir, os.path.basename(input_path).rsplit(".", 1)[0] + ".pdf")
+
+    async def stop(self):
+        pass
+
+
+class UnoserverBackend:
+    """Har bir worker uchun doimiy unoserver (warm soffice); fayllar unoconvert orqali yuboriladi."""
+
+    name = "unoserver"
+
+    def __init__(self):
+        self.servers = []
+
+    @staticmethod
+    def available():
+        return shutil.which("unoserver") is not None and shutil.which("unoconvert") is not None
+
+    @staticmethod
+    def _port(worker):
+        return UNOSERVER_BASE_PORT + 2 * worker
+
+    async def start(self, concurrency, workdir):
+        for worker in range(concurrency):
+            port = self._port(worker)
+            self.servers.append(subprocess.Popen(
+                ["unoserver", "--interface", "127.0.0.1", "--port", str(port), "--uno-port", str(port + 1),
+                 "--user-installation", _profile_url(workdir, worker)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ))
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        for worker in range(concurrency):
+            while True:
+                try:
+                    socket.create_connection(("127.0.0.1", self._port(worker)), timeout=1).close()
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"unoserver {self._port(worker)} portida ishga tushmadi")
+                    await asyncio.sleep(0.2)
+
+    async def convert(self, worker, input_path, output_dir):
+        output_path = os.path.join(output_dir, os.path.basename(input_path).rsplit(".", 1)[0] + ".pdf")
+        process = await asyncio.create_subprocess_exec(
+            "unoconvert", "--host", "127.0.0.1", "--port", str(self._port(worker)),
+            "--convert-to", "pdf", input_path, output_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        await process.communicate()
+        return output_path if process.returncode == 0 else None
+
+    async def stop(self):
+        for server in self.servers:
+            server.terminate()
+        for server in self.servers:
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+        self.servers = []
+
+
+BACKENDS = {backend.name: backend for backend in (ColdBackend, ParallelBackend, UnoserverBackend)}
+
+
+# --- O'LCHOV ---
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def live_descendants():
+    """Joriy jarayonning tirik avlodlari: {pid: /proc/<pid>/stat maydonlari (')' dan keyingi qism)}."""
+    children, stats = {}, {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        pid = int(entry)
+        children.setdefault(int(fields[1]), []).append(pid)
+        stats[pid] = fields
+
+    descendants, stack = {}, list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        descendants[pid] = stats[pid]
+        stack.extend(children.get(pid, []))
+    return descendants
+
+
+class RSSSampler(threading.Thread):
+    """
+    Joriy jarayonning barcha avlodlari (soffice, unoserver ...) RSS yig'indisining
+    eng yuqori qiymatini kuzatadi. Thread ishlatiladi, chunki `cold` backend event loopni bloklaydi.
+    """
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss = sum(int(fields[21]) for fields in live_descendants().values()) * PAGE_SIZE
+            self.peak_bytes = max(self.peak_bytes, rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def children_cpu_seconds():
+    """Kutib olingan (tugagan) bola jarayonlarning CPU vaqti."""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def live_children_cpu_seconds():
+    """
+    Hali ishlayotgan avlodlarning CPU vaqti (utime+stime+cutime+cstime). Doimiy serverlar
+    (unoserver) faqat to'xtatilganda RUSAGE_CHILDREN ga qo'shiladi, shuning uchun alohida o'qiladi.
+    """
+    ticks = sum(sum(int(value) for value in fields[11:15]) for fields in live_descendants().values())
+    return ticks / CLOCK_TICKS
+
+
+async def run_phase(backend_cls, concurrency, fmt, docs, args, workdir):
+    backend = backend_cls()
+    phase_dir = tempfile.mkdtemp(prefix=f"{backend.name}_{concurrency}_{fmt}_", dir=workdir)
+    output_dir = os.path.join(phase_dir, "out")
+    os.makedirs(output_dir)
+
+    cpu_before = children_cpu_seconds()
+    sampler = RSSSampler(args.sample_ms / 1000)
+    sampler.start()
+
+    queue = asyncio.Queue()
+    for _ in range(args.repeat):
+        for doc in docs:
+            queue.put_nowait(doc)
+    latencies, tier_latencies, failures = [], {}, 0
+    # har bir worker o'z papkasiga yozadi: --repeat da bir hujjat bir vaqtda ikki workerda bo'lishi mumkin
+    worker_dirs = [os.path.join(output_dir, str(index)) for index in range(concurrency)]
+    for path in worker_dirs:
+        os.makedirs(path)
+
+    async def worker(index):
+        nonlocal failures
+        while not queue.empty():
+            doc = queue.get_nowait()
+            call_started = time.perf_counter()
+            output_path = await backend.convert(index, doc["path"], worker_dirs[index])
+            elapsed = time.perf_counter() - call_started
+            if output_path and os.path.exists(output_path):
+                latencies.append(elapsed)
+                tier_latencies.setdefault(doc["tier"], []).append(elapsed)
+                os.remove(output_path)
+            else:
+                failures += 1
+
+    try:
+        started = time.perf_counter()
+        await backend.start(concurrency, phase_dir)
+        # har bir worker profilini isitish, birinchi ishga tushish o'lchovga kirmaydi
+        await asyncio.gather(*(backend.convert(index, docs[0]["path"], worker_dirs[index]) for index in range(concurrency)))
+        startup_s = time.perf_counter() - started
+        # soffice muvaffaqiyatsiz yuklashda ham 0 qaytaradi; eski PDF o'lchov natijasini soxtalashtirmasligi kerak
+        for path in worker_dirs:
+            shutil.rmtree(path)
+            os.makedirs(path)
+        # tugagan isitish jarayonlari + hali ishlayotgan serverlarning shu paytgacha sarflagani
+        startup_cpu_s = children_cpu_seconds() - cpu_before + live_children_cpu_seconds()
+
+        measured_started = time.perf_counter()
+        await asyncio.gather(*(worker(index) for index in range(concurrency)))
+        wall_s = time.perf_counter() - measured_started
+    finally:
+        await backend.stop()
+        sampler.stop()
+        shutil.rmtree(phase_dir, ignore_errors=True)
+
+    # peak xotira isitish va server ishga tushishini ham o'z ichiga oladi; CPU esa alohida hisoblanadi
+    cpu_s = children_cpu_seconds() - cpu_before - startup_cpu_s
+    converted = len(latencies)
+    return {
+        "backend": backend.name,
+        "concurrency": concurrency,
+        "format": fmt,
+        "docs": converted,
+        "failures": failures,
+        "startup_s": round(startup_s, 3),
+        "startup_cpu_s": round(startup_cpu_s, 3),
+        "wall_s": round(wall_s, 3),
+        "docs_per_s": round(converted / wall_s, 3) if wall_s else 0.0,
+        "latency": latency_summary(latencies),
+        "latency_by_tier": {tier: latency_summary(values) for tier, values in tier_latencies.items()},
+        "cpu_s": round(cpu_s, 3),
+        "cpu_s_per_doc": round(cpu_s / converted, 3) if converted else 0.0,
+        "peak_rss_mb": round(sampler.peak_bytes / (1024 * 1024), 1),
+    }
+
+
+def phase_key(row):
+    return f"{row['backend']}/c{row['concurrency']}/{row['format']}"
+
+
+def soffice_version():
+    try:
+        return subprocess.run(["soffice", "--version"], stdout=subprocess.PIPE, timeout=60).stdout.decode().strip()
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+COMPARED_CONFIG_FIELDS = ("corpus", "tiers", "docs_per_tier", "repeat", "formats", "seed")
+
+
+def baseline_mismatches(results, baseline):
+    """Natijalarni solishtirib bo'lmaydigan qiladigan config/environment farqlari."""
+    mismatches = []
+    for field in COMPARED_CONFIG_FIELDS:
+        old, new = baseline["config"].get(field), results["config"].get(field)
+        if old != new:
+            mismatches.append(f"config.{field}: {old} -> {new}")
+    old, new = baseline["environment"].get("soffice"), results["environment"].get("soffice")
+    if old != new:
+        mismatches.append(f"environment.soffice: {old} -> {new}")
+    return mismatches
+
+
+def print_results(results, baseline=None):
+    old = {phase_key(row): row for row in baseline["phases"]} if baseline else {}
+    print(f"{'phase':<24}{'docs':>6}{'fail':>6}{'docs/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'cpu/doc':>9}{'rss MB':>9}{'vs old':>9}")
+    for row in results["phases"]:
+        key = phase_key(row)
+        change = ""
+        if key in old and old[key]["docs_per_s"]:
+            change = f"{(row['docs_per_s'] / old[key]['docs_per_s'] - 1) * 100:+.1f}%"
+        print(f"{key:<24}{row['docs']:>6}{row['failures']:>6}{row['docs_per_s']:>9}"
+              f"{row['latency']['p50_ms']:>10}{row['latency']['p95_ms']:>10}{row['latency']['p99_ms']:>10}"
+              f"{row['cpu_s_per_doc']:>9}{row['peak_rss_mb']:>9}{change:>9}")
+
+
+async def run(args):
+    workdir = tempfile.mkdtemp(prefix="convert_bench_")
+    corpus_root = args.corpus_dir or os.path.join(workdir, "corpus")
+    os.makedirs(corpus_root, exist_ok=True)
+    tiers = parse_tiers(args.tiers)
+    formats = [fmt.strip() for fmt in args.formats.split(",")]
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    backends = []
+    for name in args.backends.split(","):
+        backend_cls = BACKENDS[name.strip()]
+        if backend_cls.available():
+            backends.append(backend_cls)
+        else:
+            print(f"'{backend_cls.name}' backendi mavjud emas, o'tkazib yuborildi.")
+
+    try:
+        corpus, manifest = generate_corpus(corpus_root, tiers, args.docs_per_tier, args.seed)
+        phases = []
+        for backend_cls in backends:
+            for concurrency in concurrency_levels:
+                for fmt in formats:
+                    docs = [doc for doc in corpus if doc["format"] == fmt]
+                    row = await run_phase(backend_cls, concurrency, fmt, docs, args, workdir)
+                    print(f"{phase_key(row)}: {row['docs_per_s']} docs/s, p95 {row['latency']['p95_ms']} ms")
+                    phases.append(row)
+    finally:
+        # --corpus-dir berilgan bo'lsa korpus workdir dan tashqarida saqlanadi
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "config": {
+            "backends": [backend.name for backend in backends],
+            "concurrency": concurrency_levels,
+            "formats": formats,
+            "tiers": dict(tiers),
+            "docs_per_tier": args.docs_per_tier,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "corpus": {"key": manifest["key"], "sha256": manifest["sha256"]},
+        },
+        "environment": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "soffice": soffice_version(),
+        },
+        "phases": phases,
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="DOCX/PPTX/XLSX/TXT -> PDF konvertatsiya benchmarki")
+    parser.add_argument("--backends", default="cold,parallel,unoserver", help=f"mavjudlari: {', '.join(BACKENDS)}")
+    parser.add_argument("--concurrency", default="1,2,4", help="vergul bilan ajratilgan darajalar")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--tiers", default=DEFAULT_TIERS, help="daraja:birlik, bir birlik ~ bir sahifa")
+    parser.add_argument("--docs-per-tier", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=1, help="korpusni har bir fazada necha marta o'tkazish")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--corpus-dir", help="korpuslarni shu papkada saqlash; (seed, tiers) bo'yicha qayta ishlatiladi")
+    parser.add_argument("--sample-ms", type=float, default=50.0, help="RSS o'lchash oralig'i")
+    parser.add_argument("--json", help="natijani JSON faylga yozish")
+    parser.add_argument("--compare", help="solishtirish uchun oldingi JSON natija")
+    parser.add_argument("--force-compare", action="store_true", help="config/soffice versiyasi farq qilsa ham solishtirish")
+    args = parser.parse_args()
+
+    unknown_formats = {fmt.strip() for fmt in args.formats.split(",")} - set(FORMATS)
+    if unknown_formats:
+        parser.error(f"noma'lum format(lar): {', '.join(sorted(unknown_formats))}; mavjudlari: {', '.join(FORMATS)}")
+    unknown_backends = {name.strip() for name in args.backends.split(",")} - set(BACKENDS)
+    if unknown_backends:
+        parser.error(f"noma'lum backend(lar): {', '.join(sorted(unknown_backends))}; mavjudlari: {', '.join(BACKENDS)}")
+
+    if not shutil.which("soffice"):
+        print("soffice topilmadi. LibreOffice o'rnatilgan muhitda ishga tushiring (Dockerfile ga qarang).")
+        sys.exit(1)
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        mismatches = baseline_mismatches(results, baseline)
+        for line in mismatches:
+            print(f"OGOHLANTIRISH: {line}")
+        if mismatches and not args.force_compare:
+            print("Baseline boshqa sharoitda olingan, solishtirish o'tkazib yuborildi (--force-compare).")
+            baseline = None
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,678 @@
+"""
+Webhook yuklama testi (end-to-end).
+
+`main.create_app` dan olingan aiohttp ilovasi lokal soxta Telegram Bot API
+serveriga ulanadi, lokal Postgres bilan ishlaydi va `telegram_webhook` ga
+sintetik update oqimlari yuboriladi. Natija: throughput, har bir handler
+uchun p50/p95/p99, update boshiga DB so'rovlari soni va peak RSS.
+
+Ishga tushirish (repo ildizidan):
+
+    python benchmarks/webhook_load.py --database-url postgresql://localhost/bench_bot \
+        --sessions 500 --concurrency 50 --json bench_output.json
+
+Trace ni saqlab, keyin aynan o'sha oqimni qayta ishlatish:
+
+    python benchmarks/webhook_load.py --trace-out trace.jsonl ...
+    python benchmarks/webhook_load.py --trace trace.jsonl ...
+
+Har bir ishga tushirishdan oldin bench foydalanuvchilari (ID >= 2**53) DB dan
+o'chiriladi, shuning uchun bir xil trace bir xil boshlang'ich holatdan boshlanadi.
+`--soffice` bilan yuklanadigan fayllar `convert_throughput` korpusidagi haqiqiy
+hujjatlar bo'ladi va soffice ularni haqiqatan konvertatsiya qiladi.
+
+Regressiyani tekshirish (natija yomonlashsa exit kodi 1):
+
+    python benchmarks/webhook_load.py --baseline old.json --max-regression 0.15 ...
+
+Baseline boshqa sozlamalar yoki trace bilan olingan bo'lsa, solishtirish rad etiladi.
+Tezlikdan tashqari xatolar soni va upload lar uchun download/sendDocument soni ham tekshiriladi.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import resource
+import contextvars
+
+from aiohttp import web, ClientSession
+
+from bench_stats import percentile
+from convert_throughput import generate_corpus, parse_tiers
+
+BENCH_BOT_TOKEN = "123456:BENCH-fake-token"
+BENCH_ADMIN_ID = 1
+# Telegram 2**52 dan katta ID bermaydi; bench foydalanuvchilari faqat shu oraliqda yaratiladi va o'chiriladi
+BENCH_USER_ID_START = 2**53
+BENCH_USER_ID_LIMIT = BENCH_USER_ID_START + 2**20
+
+FILE_TYPES = {
+    # tugma matni -> (fayl kaliti, kengaytma). main.py kengaytmani fayl kaliti bilan
+    # solishtiradi, shuning uchun EXCEL fayllari ".excel" bilan yuboriladi.
+    "DOCX ➡️ PDF": ("docx", "docx"),
+    "PPTX ➡️ PDF": ("pptx", "pptx"),
+    "EXCEL ➡️ PDF": ("excel", "excel"),
+    "TXT ➡️ PDF": ("txt", "txt"),
+}
+
+MAX_UPLOAD_MB = 100
+# Bulutdagi Bot API bundan katta fayllar uchun getFile da "file is too big" qaytaradi
+GET_FILE_LIMIT_MB = 20
+
+DEFAULT_SESSION_MIX = "browse:3,convert:5,pay:2"
+DEFAULT_SIZE_MIX = "0.05:50,1:35,10:12,20:3"
+DEFAULT_FIXTURE_TIERS = "small:1,medium:10,large:50"
+
+# bot fayl kaliti -> convert_throughput korpusidagi format
+FIXTURE_FORMATS = {"docx": "docx", "pptx": "pptx", "excel": "xlsx", "txt": "txt"}
+
+# Har bir update uchun DB hisoblagichlari (aiohttp har bir so'rovni alohida taskda bajaradi)
+_update_stats = contextvars.ContextVar("update_stats", default=None)
+
+
+def file_source(file_id):
+    """file_id "<manba>-<user_id>-<n>" ko'rinishida; manba bayt soni yoki fixture nomi."""
+    return file_id.rsplit("-", 2)[0]
+
+
+def parse_mix(text):
+    mix = []
+    for part in text.split(","):
+        key, weight = part.split(":")
+        mix.append((key.strip(), float(weight)))
+    return mix
+
+
+# --- SOXTA BOT API SERVER ---
+class FakeBotAPI:
+    """
+    Bot API metodlarini stub qiladi. Yuklab olinadigan fayl fixture bo'lsa haqiqiy
+    hujjat beriladi, aks holda so'ralgan hajmdagi nol baytlar generatsiya qilinadi.
+    """
+
+    def __init__(self, latency=0.0, fixtures=None):
+        self.latency = latency
+        self.fixtures = fixtures or {}
+        self.calls = {}
+        self.message_id = 0
+
+    def create_app(self):
+        app = web.Application(client_max_size=(MAX_UPLOAD_MB + 1) * 1024 * 1024)
+        app.router.add_post("/bot{token}/{method}", self.handle_method)
+        app.router.add_get("/file/bot{token}/{path:.+}", self.handle_file)
+        return app
+
+    def _message(self, chat_id):
+        self.message_id += 1
+        return {
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id), "type": "private"},
+        }
+
+    async def handle_method(self, request):
+        method = request.match_info["method"]
+        self.calls[method] = self.calls.get(method, 0) + 1
+        data = await request.post()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method == "getMe":
+            result = {"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        elif method == "getFile":
+            file_id = data["file_id"]
+            source = file_source(file_id)
+            size = os.path.getsize(self.fixtures[source]) if source in self.fixtures else int(source)
+            if size > GET_FILE_LIMIT_MB * 1024 * 1024:
+                return web.json_response(
+                    {"ok": False, "error_code": 400, "description": "Bad Request: file is too big"}, status=400)
+            result = {
+                "file_id": file_id,
+                "file_unique_id": file_id,
+                "file_size": size,
+                "file_path": f"documents/{file_id}",
+            }
+        elif method.startswith("send"):
+            result = self._message(data.get("chat_id", 0))
+        else:
+            # setWebhook, deleteWebhook, deleteMessage, answerCallbackQuery, answerPreCheckoutQuery ...
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def handle_file(self, request):
+        self.calls["download"] = self.calls.get("download", 0) + 1
+        source = file_source(request.match_info["path"].split("/")[-1])
+        if source in self.fixtures:
+            return web.FileResponse(self.fixtures[source])
+        size = int(source)
+        response = web.StreamResponse(headers={"Content-Length": str(size)})
+        await response.prepare(request)
+        chunk = b"\0" * 65536
+        remaining = size
+        while remaining > 0:
+            await response.write(chunk[:remaining])
+            remaining -= len(chunk)
+        await response.write_eof()
+        return response
+
+
+# --- TRAFIK GENERATSIYASI ---
+class TraceBuilder:
+    """Sintetik foydalanuvchi sessiyalari. Har bir sessiya ketma-ket bajariladigan qadamlar ro'yxati."""
+
+    def __init__(self, seed, size_mix, uploads_per_session, fixtures=None):
+        self.rng = random.Random(seed)
+        self.size_mix = size_mix
+        # fayl kaliti -> [(fixture nomi, hajmi)]; berilsa size_mix o'rniga ishlatiladi
+        self.fixtures = fixtures
+        self.uploads_per_session = uploads_per_session
+        self.message_id = 0
+
+    def _user(self, user_id):
+        return {"id": user_id, "is_bot": False, "first_name": "Bench", "username": f"bench{user_id}"}
+
+    def _message(self, user_id, **fields):
+        self.message_id += 1
+        message = {
+            "message_id": self.message_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": self._user(user_id),
+        }
+        message.update(fields)
+        return message
+
+    def _text(self, kind, user_id, text):
+        return {"kind": kind, "update": {"message": self._message(user_id, text=text)}}
+
+    def _pick_size(self):
+        sizes, weights = zip(*self.size_mix)
+        size_mb = self.rng.choices(sizes, weights=weights)[0]
+        return max(1, int(float(size_mb) * 1024 * 1024))
+
+    def browse(self, user_id):
+        return [
+            self._text("start", user_id, "/start"),
+            self._text("menu:convert", user_id, "🔄 Konvertatsiya"),
+            self._text("menu:help", user_id, "ℹ️ Yordam"),
+            self._text("menu:balance", user_id, "💰 Balansim"),
+        ]
+
+    def convert(self, user_id):
+        steps = [
+            self._text("start", user_id, "/start"),
+            self._text("menu:convert", user_id, "🔄 Konvertatsiya"),
+        ]
+        for n in range(self.uploads_per_session):
+            button = self.rng.choice(list(FILE_TYPES))
+            file_key, extension = FILE_TYPES[button]
+            if self.fixtures:
+                source, size = self.rng.choice(self.fixtures[file_key])
+            else:
+                size = self._pick_size()
+                source = str(size)
+            file_id = f"{source}-{user_id}-{n}"
+            document = {
+                "file_id": file_id,
+                "file_unique_id": file_id,
+                "file_name": f"bench_{user_id}_{n}.{extension}",
+                "file_size": size,
+            }
+            steps.append(self._text(f"pick:{file_key}", user_id, button))
+            steps.append({"kind": f"upload:{file_key}", "update": {"message": self._message(user_id, document=document)}})
+        return steps
+
+    def pay(self, user_id):
+        amount = self.rng.choice([5000, 10000, 25000])
+        payload = f"deposit_{user_id}_{amount}"
+        callback = {
+            "id": f"cb-{user_id}",
+            "from": self._user(user_id),
+            "chat_instance": "bench",
+            "data": "deposit_start",
+            "message": self._message(user_id, text="balance"),
+        }
+        pre_checkout = {
+            "id": f"pcq-{user_id}",
+            "from": self._user(user_id),
+            "currency": "UZS",
+            "total_amount": amount * 100,
+            "invoice_payload": payload,
+        }
+        payment = {
+            "currency": "UZS",
+            "total_amount": amount * 100,
+            "invoice_payload": payload,
+            "telegram_payment_charge_id": f"tg-{user_id}",
+            "provider_payment_charge_id": f"pr-{user_id}",
+        }
+        return [
+            self._text("start", user_id, "/start"),
+            self._text("menu:balance", user_id, "💰 Balansim"),
+            {"kind": "callback:deposit", "update": {"callback_query": callback}},
+            self._text("deposit_amount", user_id, str(amount)),
+            {"kind": "pre_checkout", "update": {"pre_checkout_query": pre_checkout}},
+            {"kind": "payment", "update": {"message": self._message(user_id, successful_payment=payment)}},
+        ]
+
+    def build(self, sessions, session_mix):
+        names, weights = zip(*session_mix)
+        trace = []
+        if sessions > BENCH_USER_ID_LIMIT - BENCH_USER_ID_START:
+            raise ValueError(f"sessiyalar soni {BENCH_USER_ID_LIMIT - BENCH_USER_ID_START} dan oshmasligi kerak")
+        for i in range(sessions):
+            name = self.rng.choices(names, weights=weights)[0]
+            trace.append(getattr(self, name)(BENCH_USER_ID_START + i))
+        return trace
+
+
+def save_trace(header, trace, path):
+    """Birinchi qator header (generator sozlamalari va fixture rejimi), keyingilari sessiyalar."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"header": header}, ensure_ascii=False) + "\n")
+        for session in trace:
+            f.write(json.dumps(session, ensure_ascii=False) + "\n")
+
+
+def load_trace(path):
+    with open(path, encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or not isinstance(lines[0], dict) or "header" not in lines[0]:
+        raise ValueError("trace faylida header yo'q; uni --trace-out bilan qayta yarating")
+    return lines[0]["header"], lines[1:]
+
+
+def trace_sha256(trace):
+    return hashlib.sha256(json.dumps(trace, sort_keys=True).encode()).hexdigest()
+
+
+def trace_fixture_names(trace):
+    names = set()
+    for session in trace:
+        for step in session:
+            document = step["update"].get("message", {}).get("document")
+            if document:
+                names.add(file_source(document["file_id"]))
+    return names
+
+
+# --- O'LCHOV ---
+class Collector:
+    def __init__(self):
+        self.latencies = {}
+        self.queries = {}
+        self.connections = {}
+        self.errors = {}
+
+    def record(self, kind, elapsed, stats, ok):
+        self.latencies.setdefault(kind, []).append(elapsed)
+        self.queries.setdefault(kind, []).append(stats["queries"])
+        self.connections.setdefault(kind, []).append(stats["connections"])
+        if not ok:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+def instrument(main, collector):
+    """DB so'rovlari va ulanishlarni sanash uchun main moduliga hisoblagichlar ulaydi."""
+
+    class CountingCursor(main.RealDictCursor):
+        def execute(self, query, vars=None):
+            stats = _update_stats.get()
+            if stats is not None:
+                stats["queries"] += 1
+            return super().execute(query, vars)
+
+    original_connection = main.get_db_connection
+
+    def counting_connection():
+        stats = _update_stats.get()
+        if stats is not None:
+            stats["connections"] += 1
+        return original_connection()
+
+    main.RealDictCursor = CountingCursor
+    main.get_db_connection = counting_connection
+
+    @web.middleware
+    async def measure(request, handler):
+        kind = request.headers.get("X-Bench-Kind", "unknown")
+        stats = {"queries": 0, "connections": 0}
+        token = _update_stats.set(stats)
+        started = time.perf_counter()
+        ok = True
+        try:
+            return await handler(request)
+        except Exception:
+            ok = False
+            raise
+        finally:
+            collector.record(kind, time.perf_counter() - started, stats, ok)
+            _update_stats.reset(token)
+
+    return measure
+
+
+def stub_conversion(main, delay):
+    """soffice o'rniga kichik PDF yozadi; konvertatsiya tezligi benchmarks/ dagi alohida testda o'lchanadi."""
+
+    async def convert_to_pdf(input_path, output_dir):
+        if delay:
+            await asyncio.sleep(delay)
+        pdf_path = os.path.join(output_dir, os.path.basename(input_path).rsplit(".", 1)[0] + ".pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4\n%%EOF\n")
+        return pdf_path
+
+    main.convert_to_pdf = convert_to_pdf
+
+
+def load_fixtures(args):
+    """
+    --soffice uchun convert_throughput korpusidan haqiqiy hujjatlar.
+    Qaytaradi: ({fixture nomi: yo'l}, {fayl kaliti: [(nom, hajm)]}, korpus manifesti)
+    """
+    corpus, manifest = generate_corpus(args.fixtures_dir, parse_tiers(args.fixture_tiers), 1, args.seed)
+    paths, by_key = {}, {}
+    for file_key, fmt in FIXTURE_FORMATS.items():
+        for doc in corpus:
+            if doc["format"] == fmt:
+                name = os.path.basename(doc["path"])
+                paths[name] = doc["path"]
+                by_key.setdefault(file_key, []).append((name, os.path.getsize(doc["path"])))
+    return paths, by_key, manifest
+
+
+def prepare_workload(args, parser):
+    """
+    Trace va fixture larni tayyorlaydi. Trace boshqa rejimda (fixture / hajm) yoki boshqa
+    korpus bilan yozilgan bo'lsa, qayta ishlatish rad etiladi.
+    Qaytaradi: (header, trace, {fixture nomi: yo'l})
+    """
+    fixture_paths, fixtures, fixture_corpus = {}, None, None
+    if args.soffice:
+        fixture_paths, fixtures, manifest = load_fixtures(args)
+        fixture_corpus = {"key": manifest["key"], "sha256": manifest["sha256"]}
+
+    if args.trace:
+        try:
+            header, trace = load_trace(args.trace)
+        except ValueError as e:
+            parser.error(str(e))
+        if header["fixtures"] != args.soffice:
+            parser.error("trace " + ("--soffice fixture lari" if header["fixtures"] else "hajm bo'yicha fayllar")
+                         + " bilan yozilgan; --soffice ni shunga moslang")
+        if args.soffice:
+            if header["fixture_corpus"]["key"] != fixture_corpus["key"]:
+                parser.error("trace boshqa fixture korpusi bilan yozilgan (--fixture-tiers/--seed ni tekshiring)")
+            missing = trace_fixture_names(trace) - set(fixture_paths)
+            if missing:
+                parser.error(f"joriy korpusda yo'q fixture lar: {', '.join(sorted(missing))}")
+        # o'lchov sharoiti joriy korpusga bog'lanadi
+        header = dict(header, fixture_corpus=fixture_corpus)
+    else:
+        builder = TraceBuilder(args.seed, parse_mix(args.size_mix), args.uploads_per_session, fixtures)
+        trace = builder.build(args.sessions, parse_mix(args.session_mix))
+        header = {
+            "fixtures": args.soffice,
+            "fixture_corpus": fixture_corpus,
+            "generator": {
+                "sessions": args.sessions,
+                "session_mix": args.session_mix,
+                "size_mix": None if args.soffice else args.size_mix,
+                "uploads_per_session": args.uploads_per_session,
+                "seed": args.seed,
+            },
+        }
+    if args.trace_out:
+        save_trace(header, trace, args.trace_out)
+    return header, trace, fixture_paths
+
+
+def run_config(args, header, trace):
+    """Natijalarni solishtirish mumkin bo'lishi uchun bir xil bo'lishi kerak bo'lgan sozlamalar."""
+    return dict(
+        header["generator"],
+        trace_sha256=trace_sha256(trace),
+        soffice=header["fixtures"],
+        fixture_corpus=header["fixture_corpus"],
+        concurrency=args.concurrency,
+        flood_rate=args.flood_rate,
+        api_latency_ms=args.api_latency_ms,
+        convert_delay_ms=None if args.soffice else args.convert_delay_ms,
+    )
+
+
+def reset_database(main):
+    conn = main.psycopg2.connect(main.DATABASE_URL)
+    cur = conn.cursor()
+    bench_range = (BENCH_USER_ID_START, BENCH_USER_ID_LIMIT)
+    cur.execute("DELETE FROM user_stats WHERE user_id >= %s AND user_id < %s", bench_range)
+    cur.execute("DELETE FROM users WHERE user_id >= %s AND user_id < %s", bench_range)
+    conn.commit()
+    cur.close()
+    conn.close()
+
+
+# --- REPLAY ---
+async def replay(trace, webhook_url, concurrency):
+    queue = asyncio.Queue()
+    for session in trace:
+        queue.put_nowait(session)
+    update_id = 0
+    failures = []
+
+    async def worker(client):
+        nonlocal update_id
+        while not queue.empty():
+            session = queue.get_nowait()
+            for step in session:
+                update_id += 1
+                payload = dict(step["update"], update_id=update_id)
+                async with client.post(webhook_url, json=payload, headers={"X-Bench-Kind": step["kind"]}) as response:
+                    await response.read()
+                    if response.status != 200:
+                        failures.append((step["kind"], response.status))
+                        # sessiya holati buzilgan, keyingi qadamlarni yuborishdan foyda yo'q
+                        break
+
+    async with ClientSession() as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return update_id, elapsed, failures
+
+
+def build_report(collector, fake_api, updates, elapsed, failures, config):
+    handlers = {}
+    for kind, latencies in sorted(collector.latencies.items()):
+        queries = collector.queries[kind]
+        connections = collector.connections[kind]
+        handlers[kind] = {
+            "count": len(latencies),
+            "errors": collector.errors.get(kind, 0),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "db_queries_per_update": round(sum(queries) / len(queries), 2),
+            "db_connections_per_update": round(sum(connections) / len(connections), 2),
+        }
+    total_queries = sum(sum(q) for q in collector.queries.values())
+    uploads = sum(row["count"] for kind, row in handlers.items() if kind.startswith("upload:"))
+    return {
+        "config": config,
+        "updates": updates,
+        "failed_updates": len(failures),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_ups": round(updates / elapsed, 2) if elapsed else 0.0,
+        "db_queries_per_update": round(total_queries / updates, 2) if updates else 0.0,
+        # Linux da ru_maxrss KB da; soxta API va yuklama generatori ham shu jarayonda
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_rss_children_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "api_calls": dict(sorted(fake_api.calls.items())),
+        # bot konvertatsiya xatolarini o'zi ushlab, PDF o'rniga xabar yuboradi; ular shu yerda ko'rinadi
+        "conversions": {
+            "uploads": uploads,
+            "download": fake_api.calls.get("download", 0),
+            "sendDocument": fake_api.calls.get("sendDocument", 0),
+        },
+        "handlers": handlers,
+    }
+
+
+def print_report(report):
+    print(f"Updates: {report['updates']} ({report['failed_updates']} xato), "
+          f"vaqt: {report['elapsed_s']} s, throughput: {report['throughput_ups']} update/s")
+    print(f"DB so'rovlari/update: {report['db_queries_per_update']}, "
+          f"peak RSS: {report['peak_rss_mb']} MB (bolalar: {report['peak_rss_children_mb']} MB)")
+    print(f"{'handler':<20}{'count':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/upd':>8}{'conn/upd':>10}")
+    for kind, row in report["handlers"].items():
+        print(f"{kind:<20}{row['count']:>8}{row['errors']:>6}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+              f"{row['p99_ms']:>10}{row['db_queries_per_update']:>8}{row['db_connections_per_update']:>10}")
+    print("API chaqiruvlari: " + ", ".join(f"{k}={v}" for k, v in report["api_calls"].items()))
+    conversions = report["conversions"]
+    for call in ("download", "sendDocument"):
+        if conversions[call] != conversions["uploads"]:
+            print(f"OGOHLANTIRISH: {conversions['uploads']} ta upload, lekin {call}={conversions[call]}")
+
+
+def config_mismatches(report_config, baseline_config):
+    return [f"{key}: {baseline_config.get(key)} -> {report_config.get(key)}"
+            for key in sorted(set(report_config) | set(baseline_config))
+            if report_config.get(key) != baseline_config.get(key)]
+
+
+def compare_with_baseline(report, baseline, max_regression):
+    regressions = []
+    if report["throughput_ups"] < baseline["throughput_ups"] * (1 - max_regression):
+        regressions.append(f"throughput {baseline['throughput_ups']} -> {report['throughput_ups']} update/s")
+    if report["db_queries_per_update"] > baseline["db_queries_per_update"] * (1 + max_regression):
+        regressions.append(f"db_queries_per_update {baseline['db_queries_per_update']} -> {report['db_queries_per_update']}")
+    for kind, row in report["handlers"].items():
+        old = baseline.get("handlers", {}).get(kind)
+        if old and row["p95_ms"] > old["p95_ms"] * (1 + max_regression):
+            regressions.append(f"{kind} p95 {old['p95_ms']} -> {row['p95_ms']} ms")
+        old_errors = old["errors"] if old else 0
+        if row["errors"] > old_errors:
+            regressions.append(f"{kind} xatolar {old_errors} -> {row['errors']}")
+    if report["failed_updates"] > baseline["failed_updates"]:
+        regressions.append(f"failed_updates {baseline['failed_updates']} -> {report['failed_updates']}")
+    # tezroq, lekin konvertatsiyasiz upload ham regressiya
+    conversions, old_conversions = report["conversions"], baseline["conversions"]
+    for call in ("download", "sendDocument"):
+        missing = conversions["uploads"] - conversions[call]
+        old_missing = old_conversions["uploads"] - old_conversions[call]
+        if missing > old_missing:
+            regressions.append(f"{call}: {conversions[call]}/{conversions['uploads']} upload "
+                               f"(baseline: {old_conversions[call]}/{old_conversions['uploads']})")
+    return regressions
+
+
+async def run(args, config, trace, fixture_paths):
+    # main.py sozlamalarni import paytida o'qiydi, shuning uchun muhit oldindan tayyorlanadi
+    os.environ.update({
+        "BOT_TOKEN": BENCH_BOT_TOKEN,
+        "ADMIN_ID": str(BENCH_ADMIN_ID),
+        "DATABASE_URL": args.database_url,
+        "BASE_WEBHOOK_URL": f"http://{args.host}:{args.port}",
+        "PAYMENT_TOKEN": "bench-payment-token",
+    })
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import main
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+
+    fake_api = FakeBotAPI(latency=args.api_latency_ms / 1000, fixtures=fixture_paths)
+    api_runner = web.AppRunner(fake_api.create_app())
+    await api_runner.setup()
+    await web.TCPSite(api_runner, args.host, args.api_port).start()
+    main.bot.session = AiohttpSession(api=TelegramAPIServer.from_base(f"http://{args.host}:{args.api_port}"))
+
+    for middleware in main.dp.message.middleware:
+        if isinstance(middleware, main.AntiFloodMiddleware):
+            middleware.rate_limit = args.flood_rate
+
+    collector = Collector()
+    app = main.create_app()
+    app.middlewares.append(instrument(main, collector))
+    if not args.soffice:
+        stub_conversion(main, args.convert_delay_ms / 1000)
+
+    bot_runner = web.AppRunner(app)
+    await bot_runner.setup()  # on_startup: init_db() va setWebhook
+    await web.TCPSite(bot_runner, args.host, args.port).start()
+    if not args.keep_db:
+        reset_database(main)
+
+    try:
+        updates, elapsed, failures = await replay(trace, main.WEBHOOK_URL, args.concurrency)
+    finally:
+        await bot_runner.cleanup()
+        await main.bot.session.close()
+        await api_runner.cleanup()
+
+    return build_report(collector, fake_api, updates, elapsed, failures, config)
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Webhook yuklama testi (soxta Bot API + lokal Postgres)")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL", "postgresql://localhost/bench_bot"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8181, help="bot webhook porti")
+    parser.add_argument("--api-port", type=int, default=8182, help="soxta Bot API porti")
+    parser.add_argument("--sessions", type=int, default=200, help="sintetik foydalanuvchi sessiyalari soni")
+    parser.add_argument("--concurrency", type=int, default=20, help="parallel foydalanuvchilar soni")
+    parser.add_argument("--session-mix", default=DEFAULT_SESSION_MIX, help="sessiya:og'irlik, masalan browse:3,convert:5,pay:2")
+    parser.add_argument("--size-mix", default=DEFAULT_SIZE_MIX, help=f"MB:og'irlik, masalan {DEFAULT_SIZE_MIX}; {GET_FILE_LIMIT_MB} MB dan kattasi getFile da rad etiladi")
+    parser.add_argument("--uploads-per-session", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace", help="oldin saqlangan trace faylini qayta ishlatish")
+    parser.add_argument("--trace-out", help="generatsiya qilingan trace ni saqlash")
+    parser.add_argument("--flood-rate", type=float, default=0.0, help="AntiFloodMiddleware limiti (default: o'chirilgan)")
+    parser.add_argument("--api-latency-ms", type=float, default=0.0, help="soxta Bot API javob kechikishi")
+    parser.add_argument("--soffice", action="store_true",
+                        help="haqiqiy soffice konvertatsiyasi; yuklanadigan fayllar korpus fixture laridan olinadi (--size-mix e'tiborsiz)")
+    parser.add_argument("--fixture-tiers", default=DEFAULT_FIXTURE_TIERS, help="--soffice uchun korpus darajalari (daraja:birlik)")
+    parser.add_argument("--fixtures-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fixtures"),
+                        help="--soffice korpusi saqlanadigan papka")
+    parser.add_argument("--convert-delay-ms", type=float, default=0.0, help="stub konvertatsiya kechikishi")
+    parser.add_argument("--keep-db", action="store_true",
+                        help="oldingi bench foydalanuvchilarini o'chirmaslik (--trace va --baseline bilan ishlamaydi)")
+    parser.add_argument("--json", help="natijani JSON faylga yozish")
+    parser.add_argument("--baseline", help="solishtirish uchun oldingi JSON natija")
+    parser.add_argument("--max-regression", type=float, default=0.1, help="ruxsat etilgan yomonlashish ulushi")
+    args = parser.parse_args()
+    # bir xil trace faqat bir xil boshlang'ich DB holatida solishtiriladigan natija beradi
+    if args.keep_db and (args.trace or args.baseline):
+        parser.error("--keep-db ni --trace yoki --baseline bilan ishlatib bo'lmaydi")
+
+    header, trace, fixture_paths = prepare_workload(args, parser)
+    config = run_config(args, header, trace)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        # boshqa yuklama bilan olingan baseline bilan solishtirish hech narsani bildirmaydi
+        mismatches = config_mismatches(config, baseline["config"])
+        if mismatches:
+            parser.error("baseline boshqa sozlamalar bilan olingan: " + "; ".join(mismatches))
+
+    report = asyncio.run(run(args, config, trace, fixture_paths))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if baseline:
+        regressions = compare_with_baseline(report, baseline, args.max_regression)
+        for line in regressions:
+            print(f"REGRESSIYA: {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -679,8 +679,8 @@ def create_app():
     return app
 
 async def telegram_webhook(request, dispatcher):
-    update = Update.model_validate(await request.json(), context={'bot': dispatcher.bot})
-    await dispatcher.feed_update(update)
+    update = Update.model_validate(await request.json(), context={'bot': bot})
+    await dispatcher.feed_update(bot, update)
     return web.Response()
 
 app = create_app()